@@ -12,6 +12,7 @@ from hdx.data.user import User
 from hdx.facades.infer_arguments import facade
 from hdx.scraper.worldpop._version import __version__
 from hdx.scraper.worldpop.pipeline import Pipeline
+from hdx.scraper.worldpop.profiler import Profiler
 from hdx.utilities.dateparse import now_utc
 from hdx.utilities.downloader import Download
 from hdx.utilities.path import (
@@ -29,12 +30,14 @@ lookup = "hdx-scraper-worldpop"
 def main(
     save: bool = False,
     use_saved: bool = False,
+    profile: str | None = None,
 ) -> None:
     """Generate datasets and create them in HDX
 
     Args:
         save (bool): Save downloaded data. Defaults to False.
         use_saved (bool): Use saved data. Defaults to False.
+        profile (str | None): Profile "all" or comma separated ISO3s/aliases. Defaults to None.
     Returns:
         None
     """
@@ -49,37 +52,46 @@ def main(
         )
     with wheretostart_tempdir_batch(lookup) as info:
         folder = info["folder"]
+        if profile:
+            # The batch folder is deleted on success so profiles go alongside it
+            profiler = Profiler(f"{folder}_profile", profile)
+        else:
+            profiler = None
         with Download() as downloader:
             retriever = Retrieve(
                 downloader, folder, "saved_data", folder, save, use_saved
             )
             today = now_utc()
             year = today.year
-            worldpop = Pipeline(retriever, configuration, year)
-            worldpop.get_indicators_metadata()
-            _, countries = worldpop.get_countriesdata()
+            worldpop = Pipeline(retriever, configuration, year, profiler)
+            with worldpop.profile("setup"):
+                worldpop.get_indicators_metadata()
+                _, countries = worldpop.get_countriesdata()
             logger.info(f"Number of countries to upload: {len(countries)}")
 
             for _, country in progress_storing_folder(info, countries, "iso3"):
                 countryiso3 = country["iso3"]
-                datasets, showcases = worldpop.generate_datasets_and_showcases(
-                    countryiso3
-                )
-                for i, dataset in enumerate(datasets):
-                    dataset.update_from_yaml(
-                        script_dir_plus_file(
-                            join("config", "hdx_dataset_static.yaml"), main
-                        )
-                    )
-                    dataset.create_in_hdx(
-                        match_resource_order=True,
-                        remove_additional_resources=True,
-                        updated_by_script="HDX Scraper: WorldPop",
-                        batch=info["batch"],
+                with worldpop.profile(countryiso3):
+                    datasets, showcases = worldpop.generate_datasets_and_showcases(
+                        countryiso3
                     )
-                    showcase = showcases[i]
-                    showcase.create_in_hdx()
-                    showcase.add_dataset(dataset)
+                    for i, dataset in enumerate(datasets):
+                        dataset.update_from_yaml(
+                            script_dir_plus_file(
+                                join("config", "hdx_dataset_static.yaml"), main
+                            )
+                        )
+                        dataset.create_in_hdx(
+                            match_resource_order=True,
+                            remove_additional_resources=True,
+                            updated_by_script="HDX Scraper: WorldPop",
+                            batch=info["batch"],
+                        )
+                        showcase = showcases[i]
+                        showcase.create_in_hdx()
+                        showcase.add_dataset(dataset)
+            if profiler:
+                profiler.write_summary()
 
     logger.info("HDX Scraper WorldPop pipeline completed!")
 
@@ -8,17 +8,26 @@ Reads WorldPop JSON and creates datasets.
 """
 
 import logging
+from contextlib import nullcontext
+from typing import Optional
 
 from hdx.api.configuration import Configuration
 from hdx.location.country import Country
 from hdx.scraper.worldpop.aliasdata import AliasData
+from hdx.scraper.worldpop.profiler import Profiler
 from hdx.utilities.retriever import Retrieve
 
 logger = logging.getLogger(__name__)
 
 
 class Pipeline:
-    def __init__(self, retriever: Retrieve, configuration: Configuration, year: int):
+    def __init__(
+        self,
+        retriever: Retrieve,
+        configuration: Configuration,
+        year: int,
+        profiler: Optional[Profiler] = None,
+    ):
         self._retriever = retriever
         self._configuration = configuration
         self._year = year
@@ -26,6 +35,7 @@ class Pipeline:
         self._indicators = configuration["indicators"]
         self._indicators_metadata = {}
         self._countriesdata = {}
+        self._profiler = profiler
         Country.countriesdata(include_unofficial=True)
 
     def get_indicators_metadata(self):
@@ -76,6 +86,49 @@ class Pipeline:
                 return None
             return countryname
 
+    def profile(self, name, *keys):
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.profile(name, *keys)
+
+    def generate_alias_dataset_and_showcase(
+        self, countryiso3, countryname, alias, country_url
+    ):
+        metadata_allyears = self._retriever.download_json(country_url)["data"]
+        # We're going to take this year's metadata and make it for all
+        # years since we're making one dataset
+        start_year = metadata_allyears[0]["popyear"]
+        index = self._year - int(start_year)
+        num_years = len(metadata_allyears)
+        if num_years > index:
+            metadata = metadata_allyears[self._year - int(start_year)]
+        else:
+            metadata = metadata_allyears[num_years - 1]
+            logger.error(f"{countryname} {alias} does not have data for {self._year}!")
+
+        # Assume that if one year is excluded, then the whole alias is out
+        if metadata["public"].lower() != "y":
+            return None, None
+        metadata["startpopyear"] = start_year
+        metadata["endpopyear"] = metadata_allyears[-1]["popyear"]
+        metadata["alias"] = alias
+        aliasdata = AliasData(
+            self._retriever,
+            self._configuration,
+            countryiso3,
+            countryname,
+            metadata,
+        )
+        dataset, showcase = aliasdata.generate_dataset_and_showcase()
+        if not dataset:
+            return None, None
+        for metadata in metadata_allyears:
+            aliasdata.add_resource_to(dataset, metadata)
+        if len(dataset.get_resources()) == 0:
+            logger.error(f"{dataset['title']} has no data!")
+            return None, None
+        return dataset, showcase
+
     def generate_datasets_and_showcases(self, countryiso3):
         datasets = []
         showcases = []
@@ -83,41 +136,12 @@ class Pipeline:
         if not countryname:
             return datasets, showcases
         for alias, country_url in self._countriesdata[countryiso3].items():
-            metadata_allyears = self._retriever.download_json(country_url)["data"]
-            # We're going to take this year's metadata and make it for all
-            # years since we're making one dataset
-            start_year = metadata_allyears[0]["popyear"]
-            index = self._year - int(start_year)
-            num_years = len(metadata_allyears)
-            if num_years > index:
-                metadata = metadata_allyears[self._year - int(start_year)]
-            else:
-                metadata = metadata_allyears[num_years - 1]
-                logger.error(
-                    f"{countryname} {alias} does not have data for {self._year}!"
+            with self.profile(f"{countryiso3}_{alias}", alias):
+                dataset, showcase = self.generate_alias_dataset_and_showcase(
+                    countryiso3, countryname, alias, country_url
                 )
-
-            # Assume that if one year is excluded, then the whole alias is out
-            if metadata["public"].lower() != "y":
-                continue
-            metadata["startpopyear"] = start_year
-            metadata["endpopyear"] = metadata_allyears[-1]["popyear"]
-            metadata["alias"] = alias
-            aliasdata = AliasData(
-                self._retriever,
-                self._configuration,
-                countryiso3,
-                countryname,
-                metadata,
-            )
-            dataset, showcase = aliasdata.generate_dataset_and_showcase()
-            if not dataset:
+            if dataset is None:
                 continue
-            for metadata in metadata_allyears:
-                aliasdata.add_resource_to(dataset, metadata)
-            if len(dataset.get_resources()) == 0:
-                logger.error(f"{dataset['title']} has no data!")
-            else:
-                datasets.append(dataset)
-                showcases.append(showcase)
+            datasets.append(dataset)
+            showcases.append(showcase)
         return datasets, showcases
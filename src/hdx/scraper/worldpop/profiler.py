@@ -0,0 +1,146 @@
+#!/usr/bin/python
+"""
+PROFILER:
+------------
+
+Optional profiling of the pipeline per country or alias. Writes a pstats file
+and a collapsed-stack file (for flamegraph tools) per profiled section and a
+summary ranking the hottest functions in the scraper and hdx libraries.
+
+"""
+
+import cProfile
+import logging
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from os import makedirs
+from os.path import join, sep
+from typing import Dict, Generator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    summary_filename = "profile_summary.txt"
+    # pipeline.py and aliasdata.py live under hdx along with the hdx libraries
+    hot_path = f"{sep}hdx{sep}"
+
+    def __init__(self, folder: str, selection: str, interval: float = 0.005):
+        """Profile sections of the run matching selection. Selection is "all"
+        for the whole run or a comma separated list of ISO3s and/or aliases.
+
+        Args:
+            folder (str): Folder in which to write profiles
+            selection (str): "all" or comma separated ISO3s and/or aliases
+            interval (float): Stack sampling interval in seconds. Defaults to 0.005.
+        """
+        self._folder = folder
+        self._selection = {x.strip().lower() for x in selection.split(",")}
+        self._interval = interval
+        self._active = False
+        self._names: List[str] = []
+        makedirs(folder, exist_ok=True)
+
+    def matches(self, *keys: str) -> bool:
+        if "all" in self._selection:
+            return True
+        return any(key.lower() in self._selection for key in keys)
+
+    def _sample(self, thread_id: int, stacks: Counter, stop: threading.Event) -> None:
+        while not stop.wait(self._interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                module = frame.f_globals.get("__name__", "?")
+                stack.append(f"{module}:{frame.f_code.co_qualname}")
+                frame = frame.f_back
+            if stack:
+                stacks[";".join(reversed(stack))] += 1
+
+    @contextmanager
+    def profile(self, name: str, *keys: str) -> Generator[None, None, None]:
+        """Profile the enclosed block if name or any of keys is selected. Nested
+        sections are covered by the outermost profiled section.
+
+        Args:
+            name (str): Name of section used in output filenames
+            *keys (str): Further keys to match against selection
+
+        Returns:
+            Generator[None, None, None]: Nothing
+        """
+        if self._active or not self.matches(name, *keys):
+            yield
+            return
+        self._active = True
+        stacks = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(), stacks, stop),
+            daemon=True,
+        )
+        profiler = cProfile.Profile()
+        sampler.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            stop.set()
+            sampler.join()
+            self._active = False
+            profiler.dump_stats(join(self._folder, f"{name}.pstats"))
+            with open(join(self._folder, f"{name}.collapsed"), "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            self._names.append(name)
+            logger.info(f"Profiled {name} into {self._folder}")
+
+    def write_summary(self, limit: int = 30) -> Optional[str]:
+        """Write a summary ranking profiled sections by total time and the
+        hottest functions in pipeline.py, aliasdata.py and the hdx libraries.
+
+        Args:
+            limit (int): Number of functions to list. Defaults to 30.
+
+        Returns:
+            Optional[str]: Path to summary or None if nothing was profiled
+        """
+        if not self._names:
+            return None
+        totals: Dict[str, float] = {}
+        combined = None
+        for name in self._names:
+            stats = pstats.Stats(join(self._folder, f"{name}.pstats"))
+            totals[name] = stats.total_tt
+            if combined is None:
+                combined = stats
+            else:
+                combined.add(stats)
+        functions = []
+        for (filename, lineno, funcname), stat in combined.stats.items():
+            if filename == __file__:
+                continue
+            if self.hot_path not in filename:
+                continue
+            _, nc, tt, ct, _ = stat
+            functions.append((tt, ct, nc, f"{filename}:{lineno}({funcname})"))
+        functions.sort(reverse=True)
+        lines = ["Sections by total time (s)"]
+        for name, total in sorted(totals.items(), key=lambda x: x[1], reverse=True):
+            lines.append(f"{total:10.3f}  {name}")
+        lines.append("")
+        lines.append("Hottest functions by own time (s)")
+        lines.append(f"{'tottime':>10}  {'cumtime':>10}  {'ncalls':>8}  function")
+        for tt, ct, nc, function in functions[:limit]:
+            lines.append(f"{tt:10.3f}  {ct:10.3f}  {nc:8d}  {function}")
+        path = join(self._folder, self.summary_filename)
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+        logger.info(f"Profile summary written to {path}")
+        return path
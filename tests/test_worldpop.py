@@ -4,6 +4,7 @@ Unit tests for worldpop.
 
 """
 
+from os import listdir
 from os.path import join
 
 import pytest
@@ -12,6 +13,7 @@ from hdx.api.configuration import Configuration
 from hdx.api.locations import Locations
 from hdx.data.vocabulary import Vocabulary
 from hdx.scraper.worldpop.pipeline import Pipeline
+from hdx.scraper.worldpop.profiler import Profiler
 from hdx.utilities.downloader import Download
 from hdx.utilities.path import script_dir_plus_file, temp_dir
 from hdx.utilities.retriever import Retrieve
@@ -274,3 +276,48 @@ class TestWorldPop:
                     "name": "xkx_agegender_structures_2025_cn_1km.zip",
                     "url": "https://data.worldpop.org/GIS/AgeSex_structures/Global_2015_2030/R2025A/2025/XKX/v1/1km_ua/xkx_agesex_structures_2025_CN_1km_R2025A_UA_v1.zip",
                 }
+
+    def test_profile(
+        self,
+        configuration,
+        input_dir,
+    ):
+        with temp_dir(
+            "TestWorldPopProfile",
+            delete_on_success=True,
+            delete_on_failure=False,
+        ) as tempdir:
+            with Download(user_agent="test") as downloader:
+                retriever = Retrieve(
+                    downloader,
+                    tempdir,
+                    input_dir,
+                    tempdir,
+                    save=False,
+                    use_saved=True,
+                )
+                profile_dir = join(tempdir, "profile")
+                profiler = Profiler(profile_dir, "afg, age_structures")
+                worldpop = Pipeline(retriever, configuration, 2025, profiler)
+                with worldpop.profile("setup"):
+                    worldpop.get_indicators_metadata()
+                    worldpop.get_countriesdata()
+                with worldpop.profile("AFG"):
+                    datasets, _ = worldpop.generate_datasets_and_showcases("AFG")
+                assert len(datasets) == 2
+                with worldpop.profile("XKX"):
+                    datasets, _ = worldpop.generate_datasets_and_showcases("XKX")
+                assert len(datasets) == 2
+                path = profiler.write_summary()
+                assert sorted(listdir(profile_dir)) == [
+                    "AFG.collapsed",
+                    "AFG.pstats",
+                    "XKX_age_structures.collapsed",
+                    "XKX_age_structures.pstats",
+                    "profile_summary.txt",
+                ]
+                with open(path) as f:
+                    summary = f.read()
+                assert "AFG\n" in summary
+                assert "XKX_age_structures\n" in summary
+                assert "profiler.py" not in summary